@@ -1,22 +1,180 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, date, timedelta
-import json
+from datetime import datetime, date
 import io
+import orjson
+from string import Template
+from types import MappingProxyType
+
+# ACR dose limits (CTDI_vol, mGy) and phantom size by protocol
+_ACR_LIMITS = MappingProxyType({
+    "Adult Abdomen": {"ref": 25, "pf": 30, "phantom": "32cm"},
+    "Adult Head": {"ref": 75, "pf": 80, "phantom": "16cm"}, 
+    "Ped Abd (45lb)": {"ref": 7.5, "pf": 10, "phantom": "32cm"},
+    "Ped Head (1y)": {"ref": 35, "pf": 40, "phantom": "16cm"}
+})
+
+# Material reference values for CT number accuracy (HU)
+_MATERIALS_REF = MappingProxyType({
+    'Air': {'expected': -1000, 'tolerance': 100},
+    'Acrylic': {'expected': 120, 'tolerance': 40},
+    'Water': {'expected': 0, 'tolerance': 7},
+    'Bone': {'expected': 850, 'tolerance': 100}
+})
+
+# Site aggregate protocol data (Radimetrics summary) based on your Excel sheet
+_PROTOCOLS = MappingProxyType({
+    'Adult Abdomen': {
+        'protocol': 'Abdomen Pelvis without',
+        'wed_cm': 30,
+        'ctdi': 18.6,
+        'emas': 201,
+        'rotation_s': 0.7,
+        'pitch': 1.375,
+        'acr_ref': 25,
+        'acr_pf': 30
+    },
+    'Adult Head': {
+        'protocol': 'CT Head wo',
+        'wed_cm': 18,
+        'ctdi': 62.03,
+        'emas': 272.9,
+        'rotation_s': 0.6,
+        'pitch': 0.938,
+        'acr_ref': 75,
+        'acr_pf': 80
+    },
+    'Ped Abd (45lb)': {
+        'protocol': 'CT PED ABD PELV',
+        'wed_cm': 19,
+        'ctdi': 4.42,
+        'emas': 47.25,
+        'rotation_s': 0.5,
+        'pitch': 1.375,
+        'acr_ref': 7.5,
+        'acr_pf': 10
+    },
+    'Ped Head (1y)': {
+        'protocol': 'CT PED BRAIN',
+        'wed_cm': 15,
+        'ctdi': 25.75,
+        'emas': 120,
+        'rotation_s': 1.0,
+        'pitch': None,
+        'acr_ref': 35,
+        'acr_pf': 40
+    }
+})
+
+# Default ROI inputs (HU) start at each material's expected value
+_MATERIAL_DEFAULTS = tuple((name, float(ref['expected'])) for name, ref in _MATERIALS_REF.items())
+
+# Minimum contrast-to-noise ratio by protocol
+_CNR_CRITERIA = MappingProxyType({
+    "Adult Head": 1.0,
+    "Adult Abdomen": 1.0,
+    "Ped Head": 0.7,
+    "Ped Abd": 0.4
+})
+
+# Minimum spatial resolution (lp/cm) by protocol
+_CRITERIA_MAP = MappingProxyType({
+    "Adult Abdomen": 6.0,
+    "Adult Head": 6.0, 
+    "Ped Abd": 6.0,
+    "Ped Head": 6.0,
+    "High Resolution Chest": 8.0
+})
+
+# Artifact impact labels indexed by severity score
+_ARTIFACT_IMPACT = np.array(["None", "Low", "High"])
+
+# Trending parameter labels and their data columns
+_PARAM_MAP = MappingProxyType({
+    "Water CT Number": "water_ct",
+    "Image Noise": "noise", 
+    "Head CTDI": "ctdi_head",
+    "Body CTDI": "ctdi_body",
+    "Uniformity": "uniformity"
+})
+
+# Control chart limits in standard deviations from the mean (LCL 3σ, LCL 2σ, UCL 2σ, UCL 3σ)
+_SIGMA_MULTIPLES = np.array([-3.0, -2.0, 2.0, 3.0])
+
+# Trend series longer than this are drawn with WebGL instead of SVG
+_WEBGL_POINT_THRESHOLD = 1000
+
+# Section instructions
+_PROTOCOL_INSTRUCTIONS = """
+**Instructions:** Review Radimetrics summary data for the following protocol categories:
+- Adult Abdomen (WED 29-31 cm) - TG220 reference
+- Adult Head (no WED filter)
+- Pediatric Abdomen (WED 18-20 cm) - TG293 reference  
+- Pediatric Head (WED 14-16 cm) - TG204 reference
+"""
 
-# Page configuration
-st.set_page_config(
-    page_title="CT Quality Control - University of Tennessee Medical Center",
-    page_icon="🏥",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+_DOSIMETRY_INSTRUCTIONS = """
+**Instructions:** 
+1. Position appropriate phantom (32cm for body, 16cm for head)
+2. Perform axial scans using clinical protocols
+3. Measure CTDI at center and 4 peripheral positions
+4. Calculate CTDI_w = (CTDI_center + 4×CTDI_periphery)/5
+"""
+
+_COLLIMATION_INSTRUCTIONS = """
+**Instructions:**
+- Use Radcal CT beam width tool (5, 10, 15 mm masks)
+- Place CTDI chamber at isocenter
+- Perform calibration exposures (recommend 80 kVp, 300 mA, 1s)
+- Test all available beam widths
+"""
+
+_CT_NUMBER_INSTRUCTIONS = """
+**Instructions:** 
+- Use ACR CT Phantom Module 1
+- Scan with clinical protocols 
+- Measure CT numbers for Air, Acrylic, Water, and Bone inserts
+- Use ROI size approximately 100 mm²
+"""
+
+_LOW_CONTRAST_INSTRUCTIONS = """
+**Instructions:**
+- Use ACR CT Phantom Module 2
+- Window Width: 100, Window Level: 100
+- ROI size: 100 mm²
+- Identify smallest visible contrast objects
+"""
+
+_UNIFORMITY_INSTRUCTIONS = """
+**Instructions:**
+- Use ACR CT Phantom Module 3
+- Window Width: 100, Window Level: 0
+- ROI size: 400 mm²
+- Measure center and 4 peripheral ROIs
+"""
+
+_ARTIFACTS_INSTRUCTIONS = """
+**Instructions:**
+- Use ACR CT Phantom Module 3
+- Window Width: 100, Window Level: 0
+- Look for streaks, rings, cupping artifacts
+- Use 32cm phantom to check for ring artifacts beyond 20cm diameter
+"""
+
+_RESOLUTION_INSTRUCTIONS = """
+**Instructions:**
+- Use ACR CT Phantom Module 4
+- Window Width: 100, Window Level: 1100
+- Determine highest resolvable line pairs per cm
+- Adult Abdomen: ≥ 6 lp/cm, High Resolution Chest: ≥ 8 lp/cm
+"""
+
+# Overall result banner; result_class is one of the pass/warning/fail CSS classes
+_RESULT_HTML = Template('<div class="$result_class"><strong>$title:</strong> $body</div>')
 
 # Custom CSS
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -64,7 +222,18 @@ st.markdown("""
         margin: 15px 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Page configuration
+st.set_page_config(
+    page_title="CT Quality Control - University of Tennessee Medical Center",
+    page_icon="🏥",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # Initialize session state
 if 'qc_data' not in st.session_state:
@@ -83,58 +252,35 @@ if 'scanner_info' not in st.session_state:
         'xray_license': '647-1384'
     }
 
+# Date stamp for download filenames, fixed for the session
+if '_today_str' not in st.session_state:
+    st.session_state._today_str = datetime.now().strftime('%Y%m%d')
+
 def main():
     st.markdown('<h1 class="main-header">🏥 CT Quality Control</h1>', unsafe_allow_html=True)
     st.markdown('<p style="text-align: center; font-size: 1.2rem; color: #666;">University of Tennessee Medical Center - ACR Standards Compliance</p>', unsafe_allow_html=True)
     
+    # Current scanner info for the sidebar
+    info = st.session_state.scanner_info
+    info_key = tuple(info.items())
+    if st.session_state.get('_sidebar_md_key') != info_key:
+        st.session_state._sidebar_md_key = info_key
+        st.session_state._sidebar_md = (
+            "### 🔧 Scanner Information\n\n"
+            f"**Facility:** {info['facility']}\n\n"
+            f"**System:** {info['manufacturer']} {info['model']}\n\n"
+            f"**Serial:** {info['serial']}\n\n"
+            f"**Physicist:** {info['physicist1']}"
+        )
+    
     # Sidebar navigation
-    st.sidebar.title("📋 Navigation")
-    test_sections = [
-        "🏥 Facility Information",
-        "📊 Protocol Review", 
-        "☢️ Dosimetry Assessment",
-        "📏 Beam Collimation",
-        "🎯 CT Number Accuracy",
-        "🔍 Low Contrast Resolution",
-        "⚖️ CT Number Uniformity",
-        "🖼️ Artifacts Assessment",
-        "📐 Spatial Resolution",
-        "📈 Data Analysis & Trending",
-        "📑 Report Generation"
-    ]
-    
-    selected_section = st.sidebar.selectbox("Select QC Section:", test_sections)
-    
-    # Display current scanner info in sidebar
-    st.sidebar.markdown("### 🔧 Scanner Information")
-    st.sidebar.markdown(f"**Facility:** {st.session_state.scanner_info['facility']}")
-    st.sidebar.markdown(f"**System:** {st.session_state.scanner_info['manufacturer']} {st.session_state.scanner_info['model']}")
-    st.sidebar.markdown(f"**Serial:** {st.session_state.scanner_info['serial']}")
-    st.sidebar.markdown(f"**Physicist:** {st.session_state.scanner_info['physicist1']}")
+    with st.sidebar.container():
+        st.title("📋 Navigation")
+        selected_section = st.selectbox("Select QC Section:", [label for label, _ in _SECTIONS])
+        st.markdown(st.session_state._sidebar_md)
     
     # Route to appropriate section
-    if selected_section == "🏥 Facility Information":
-        facility_info_section()
-    elif selected_section == "📊 Protocol Review":
-        protocol_review_section()
-    elif selected_section == "☢️ Dosimetry Assessment":
-        dosimetry_section()
-    elif selected_section == "📏 Beam Collimation":
-        beam_collimation_section()
-    elif selected_section == "🎯 CT Number Accuracy":
-        ct_number_accuracy_section()
-    elif selected_section == "🔍 Low Contrast Resolution":
-        low_contrast_resolution_section()
-    elif selected_section == "⚖️ CT Number Uniformity":
-        ct_uniformity_section()
-    elif selected_section == "🖼️ Artifacts Assessment":
-        artifacts_section()
-    elif selected_section == "📐 Spatial Resolution":
-        spatial_resolution_section()
-    elif selected_section == "📈 Data Analysis & Trending":
-        data_analysis_section()
-    elif selected_section == "📑 Report Generation":
-        report_generation_section()
+    _SECTION_MAP[selected_section]()
 
 def facility_info_section():
     st.markdown('<div class="section-header">🏥 Facility Information</div>', unsafe_allow_html=True)
@@ -182,120 +328,119 @@ def facility_info_section():
         })
         st.success("✅ Facility information saved successfully!")
 
-def protocol_review_section():
-    st.markdown('<div class="section-header">📊 Protocol Review - Site Aggregate Data</div>', unsafe_allow_html=True)
-    
-    st.info("""
-    **Instructions:** Review Radimetrics summary data for the following protocol categories:
-    - Adult Abdomen (WED 29-31 cm) - TG220 reference
-    - Adult Head (no WED filter)
-    - Pediatric Abdomen (WED 18-20 cm) - TG293 reference  
-    - Pediatric Head (WED 14-16 cm) - TG204 reference
-    """)
-    
-    # Protocol data based on your Excel sheet
-    protocols_data = {
-        'Adult Abdomen': {
-            'protocol': 'Abdomen Pelvis without',
-            'wed_cm': 30,
-            'ctdi': 18.6,
-            'emas': 201,
-            'rotation_s': 0.7,
-            'pitch': 1.375,
-            'acr_ref': 25,
-            'acr_pf': 30
-        },
-        'Adult Head': {
-            'protocol': 'CT Head wo',
-            'wed_cm': 18,
-            'ctdi': 62.03,
-            'emas': 272.9,
-            'rotation_s': 0.6,
-            'pitch': 0.938,
-            'acr_ref': 75,
-            'acr_pf': 80
-        },
-        'Ped Abd (45lb)': {
-            'protocol': 'CT PED ABD PELV',
-            'wed_cm': 19,
-            'ctdi': 4.42,
-            'emas': 47.25,
-            'rotation_s': 0.5,
-            'pitch': 1.375,
-            'acr_ref': 7.5,
-            'acr_pf': 10
-        },
-        'Ped Head (1y)': {
-            'protocol': 'CT PED BRAIN',
-            'wed_cm': 15,
-            'ctdi': 25.75,
-            'emas': 120,
-            'rotation_s': 1.0,
-            'pitch': None,
-            'acr_ref': 35,
-            'acr_pf': 40
-        }
-    }
-    
-    # Create protocol review table
-    st.subheader("Current Protocol Analysis")
-    
-    protocol_df = pd.DataFrame(protocols_data).T
-    protocol_df['% ACR Ref'] = (protocol_df['ctdi'] / protocol_df['acr_ref'] * 100).round(1)
-    protocol_df['% ACR P/F'] = (protocol_df['ctdi'] / protocol_df['acr_pf'] * 100).round(1)
-    protocol_df['Status'] = protocol_df.apply(lambda row: 
-        '🟢 Pass' if row['ctdi'] <= row['acr_pf'] else '🔴 Fail', axis=1)
-    
-    st.dataframe(protocol_df, use_container_width=True)
+def _build_protocol_table(protocols):
+    """Build the protocol review table with percent-of-limit and status columns"""
+    df = pd.DataFrame.from_dict(dict(protocols), orient='index')
+    ctdi = df['ctdi'].to_numpy(dtype=float)
+    ref = df['acr_ref'].to_numpy(dtype=float)
+    pf = df['acr_pf'].to_numpy(dtype=float)
+    derived = pd.DataFrame({
+        '% ACR Ref': (ctdi / ref * 100).round(1),
+        '% ACR P/F': (ctdi / pf * 100).round(1),
+        'Status': np.where(ctdi <= pf, '🟢 Pass', '🔴 Fail')
+    }, index=df.index)
+    return pd.concat([df, derived], axis=1)
+
+_PROTOCOLS_DF = _build_protocol_table(_PROTOCOLS)
+# Columns: measured CTDI, ACR reference, ACR pass/fail (mGy)
+_PROTOCOL_VALUES = _PROTOCOLS_DF[['ctdi', 'acr_ref', 'acr_pf']].to_numpy(dtype=float)
+
+# Figures are cached as shared resources: st.cache_data would pickle the whole
+# Figure on every hit. Arguments must be hashable primitives (tuples of numbers).
+@st.cache_resource
+def _ctdi_fig(categories, measured_ctdi, acr_ref, acr_pf):
+    """Build the CTDI comparison bar chart for the protocol review"""
+    import plotly.graph_objects as go
     
-    # CTDI comparison chart
     fig = go.Figure()
     
-    categories = list(protocols_data.keys())
-    measured_ctdi = [protocols_data[cat]['ctdi'] for cat in categories]
-    acr_ref = [protocols_data[cat]['acr_ref'] for cat in categories]
-    acr_pf = [protocols_data[cat]['acr_pf'] for cat in categories]
-    
-    fig.add_trace(go.Bar(name='Measured CTDI', x=categories, y=measured_ctdi, 
-                         marker_color='lightblue'))
-    fig.add_trace(go.Bar(name='ACR Reference', x=categories, y=acr_ref, 
-                         marker_color='orange'))
-    fig.add_trace(go.Bar(name='ACR Pass/Fail', x=categories, y=acr_pf, 
-                         marker_color='red'))
+    fig.add_traces([
+        go.Bar(name='Measured CTDI', x=categories, y=measured_ctdi, marker_color='lightblue'),
+        go.Bar(name='ACR Reference', x=categories, y=acr_ref, marker_color='orange'),
+        go.Bar(name='ACR Pass/Fail', x=categories, y=acr_pf, marker_color='red')
+    ])
     
     fig.update_layout(
         title='CTDI Comparison: Measured vs ACR Limits',
         xaxis_title='Protocol Category',
         yaxis_title='CTDI (mGy)',
-        barmode='group'
+        barmode='group',
+        transition_duration=0,
+        uirevision='ctdi-fixed'
     )
     
+    return fig
+
+def protocol_review_section():
+    st.markdown('<div class="section-header">📊 Protocol Review - Site Aggregate Data</div>', unsafe_allow_html=True)
+    
+    st.info(_PROTOCOL_INSTRUCTIONS)
+    
+    # Create protocol review table
+    st.subheader("Current Protocol Analysis")
+    
+    st.dataframe(_PROTOCOLS_DF, use_container_width=True)
+    
+    # CTDI comparison chart
+    ctdi_arr, ref_arr, pf_arr = _PROTOCOL_VALUES.T
+    fig = _ctdi_fig(tuple(_PROTOCOLS), tuple(ctdi_arr.tolist()),
+                    tuple(ref_arr.tolist()), tuple(pf_arr.tolist()))
     st.plotly_chart(fig, use_container_width=True)
     
     # Minor/Major fails summary
     col1, col2, col3 = st.columns(3)
     with col1:
-        minor_fails = sum(1 for cat in protocols_data.values() 
-                         if cat['acr_ref'] < cat['ctdi'] <= cat['acr_pf'])
+        minor_fails = int(((ctdi_arr > ref_arr) & (ctdi_arr <= pf_arr)).sum())
         st.metric("Minor Fails", minor_fails)
     with col2:
-        major_fails = sum(1 for cat in protocols_data.values() 
-                         if cat['ctdi'] > cat['acr_pf'])
+        major_fails = int((ctdi_arr > pf_arr).sum())
         st.metric("Major Fails", major_fails)
     with col3:
-        total_protocols = len(protocols_data)
+        total_protocols = len(ctdi_arr)
         st.metric("Total Protocols", total_protocols)
 
+def _eval_ctdi_w(center, top, bottom, left, right):
+    """Return (CTDI_w, mean peripheral CTDI); accepts scalars or NumPy arrays"""
+    periphery = (top + bottom + left + right) / 4
+    return (center + 4 * periphery) / 5, periphery
+
+def _eval_materials(measured, expected, tolerance):
+    """Return a boolean array marking CT numbers within tolerance of expected"""
+    return np.abs(measured - expected) <= tolerance
+
+def _store_results(name, key, render):
+    """Keep a section's rendered results alongside the inputs that produced them"""
+    st.session_state[f'_{name}_key'] = key
+    st.session_state[f'_{name}_render'] = render
+
+def _stored_results(name, key):
+    """Return the stored results for name if they were built from these inputs"""
+    if st.session_state.get(f'_{name}_key') == key:
+        return st.session_state[f'_{name}_render']
+    return None
+
+def _show_results(render):
+    """Display a stored results payload: metric columns, table, banner and notes"""
+    st.subheader(render['title'])
+    
+    if render.get('metrics'):
+        for col, metrics in zip(st.columns(len(render['metrics'])), render['metrics']):
+            with col:
+                for label, value in metrics:
+                    st.metric(label, value)
+    
+    if render.get('table') is not None:
+        st.table(render['table'])
+    
+    st.markdown(render['summary'], unsafe_allow_html=True)
+    
+    if render.get('notes'):
+        st.write(render['notes'])
+
 def dosimetry_section():
     st.markdown('<div class="section-header">☢️ Dosimetry Assessment</div>', unsafe_allow_html=True)
     
-    st.info("""
-    **Instructions:** 
-    1. Position appropriate phantom (32cm for body, 16cm for head)
-    2. Perform axial scans using clinical protocols
-    3. Measure CTDI at center and 4 peripheral positions
-    4. Calculate CTDI_w = (CTDI_center + 4×CTDI_periphery)/5
-    """)
+    st.info(_DOSIMETRY_INSTRUCTIONS)
     
     # Protocol selection
     protocol_type = st.selectbox(
@@ -316,7 +461,7 @@ def dosimetry_section():
         ctdi_left = st.number_input("Exposure Left (mR)", min_value=0.0, step=0.1, format="%.2f")
         ctdi_right = st.number_input("Exposure Right (mR)", min_value=0.0, step=0.1, format="%.2f")
         
-        ctdi_periphery_avg = (ctdi_top + ctdi_bottom + ctdi_left + ctdi_right) / 4
+        ctdi_w, ctdi_periphery_avg = _eval_ctdi_w(ctdi_center, ctdi_top, ctdi_bottom, ctdi_left, ctdi_right)
         
     with col2:
         st.subheader("⚙️ Scan Parameters")
@@ -334,35 +479,15 @@ def dosimetry_section():
         st.write(f"mAs: {mas:.1f}")
         st.write(f"nT: {nt:.1f} mm")
     
+    # Inputs that determine the displayed results
+    dosimetry_key = (ctdi_center, ctdi_top, ctdi_bottom, ctdi_left, ctdi_right, kvp, ma,
+                     rotation_time, n_detectors, detector_width, protocol_type)
+    
     # Calculate results
     if st.button("🧮 Calculate Dosimetry Results", type="primary"):
         if ctdi_center > 0 and ctdi_periphery_avg > 0:
-            # Calculate CTDI_w
-            ctdi_w = (ctdi_center + 4 * ctdi_periphery_avg) / 5
-            
             # Get ACR reference values based on protocol
-            acr_limits = {
-                "Adult Abdomen": {"ref": 25, "pf": 30, "phantom": "32cm"},
-                "Adult Head": {"ref": 75, "pf": 80, "phantom": "16cm"}, 
-                "Ped Abd (45lb)": {"ref": 7.5, "pf": 10, "phantom": "32cm"},
-                "Ped Head (1y)": {"ref": 35, "pf": 40, "phantom": "16cm"}
-            }
-            
-            limit = acr_limits[protocol_type]
-            
-            # Display results
-            st.subheader("📋 Dosimetry Results")
-            
-            col3, col4, col5 = st.columns(3)
-            with col3:
-                st.metric("CTDI Center", f"{ctdi_center:.2f} mGy")
-                st.metric("CTDI Periphery (avg)", f"{ctdi_periphery_avg:.2f} mGy")
-            with col4:
-                st.metric("CTDI_w Calculated", f"{ctdi_w:.2f} mGy")
-                st.metric("Phantom Size", limit["phantom"])
-            with col5:
-                st.metric("ACR Reference", f"{limit['ref']} mGy")
-                st.metric("ACR Pass/Fail", f"{limit['pf']} mGy")
+            limit = _ACR_LIMITS[protocol_type]
             
             # Pass/Fail evaluation
             pct_ref = (ctdi_w / limit["ref"]) * 100
@@ -378,9 +503,22 @@ def dosimetry_section():
                 status = "🔴 Major Fail - Above Pass/Fail Limit"
                 result_class = "fail-result"
             
-            st.markdown(f'<div class="{result_class}"><strong>Overall Result:</strong> {status}<br>'
-                       f'CTDI_w = {ctdi_w:.2f} mGy ({pct_ref:.1f}% of reference, {pct_pf:.1f}% of P/F limit)</div>', 
-                       unsafe_allow_html=True)
+            # Keep the rendered results so reruns with unchanged inputs reuse them
+            _store_results('dos', dosimetry_key, {
+                'title': "📋 Dosimetry Results",
+                'metrics': (
+                    (("CTDI Center", f"{ctdi_center:.2f} mGy"),
+                     ("CTDI Periphery (avg)", f"{ctdi_periphery_avg:.2f} mGy")),
+                    (("CTDI_w Calculated", f"{ctdi_w:.2f} mGy"),
+                     ("Phantom Size", limit["phantom"])),
+                    (("ACR Reference", f"{limit['ref']} mGy"),
+                     ("ACR Pass/Fail", f"{limit['pf']} mGy"))
+                ),
+                'summary': _RESULT_HTML.substitute(
+                    result_class=result_class, title="Overall Result",
+                    body=f'{status}<br>CTDI_w = {ctdi_w:.2f} mGy '
+                         f'({pct_ref:.1f}% of reference, {pct_pf:.1f}% of P/F limit)')
+            })
             
             # Save results
             if 'dosimetry_results' not in st.session_state.qc_data:
@@ -402,18 +540,18 @@ def dosimetry_section():
             }
             
         else:
+            st.session_state.pop('_dos_key', None)
             st.error("⚠️ Please enter valid CTDI measurements")
+    
+    # Display results
+    render = _stored_results('dos', dosimetry_key)
+    if render is not None:
+        _show_results(render)
 
 def beam_collimation_section():
     st.markdown('<div class="section-header">📏 Beam Collimation</div>', unsafe_allow_html=True)
     
-    st.info("""
-    **Instructions:**
-    - Use Radcal CT beam width tool (5, 10, 15 mm masks)
-    - Place CTDI chamber at isocenter
-    - Perform calibration exposures (recommend 80 kVp, 300 mA, 1s)
-    - Test all available beam widths
-    """)
+    st.info(_COLLIMATION_INSTRUCTIONS)
     
     st.subheader("🔧 Calibration Exposures")
     
@@ -453,65 +591,44 @@ def beam_collimation_section():
         'Nominal nT': [15, 10, 5, 1.25]
     }
     
-    results = []
     if without_mask > 0 and with_mask > 0 and mask_length > 0:
-        for i in range(len(test_data['n'])):
-            n = test_data['n'][i]
-            t = test_data['T'][i]
-            measured = test_data['Measured (mR)'][i]
-            nominal_nt = test_data['Nominal nT'][i]
-            
-            # Calculate beam width
-            beam_width = measured / cal_dp_l if cal_dp_l > 0 else 0
-            
-            # Calculate error
-            error = beam_width - nominal_nt
-            thirty_pct = nominal_nt * 0.3
-            criteria = max(thirty_pct, 3.0)  # Max of 30% nominal and 3mm
-            
-            pass_fail = "🟢 Pass" if abs(error) <= criteria else "🔴 Fail"
-            
-            results.append({
-                'n': n,
-                'T (mm)': t,
-                'nT Nominal (mm)': nominal_nt,
-                'Measured (mR)': measured,
-                'Beam Width (mm)': f"{beam_width:.2f}",
-                'Error (mm)': f"{error:.2f}",
-                'Criteria (mm)': f"≤{criteria:.1f}",
-                'Result': pass_fail
-            })
-    
-    if results:
-        results_df = pd.DataFrame(results)
-        st.dataframe(results_df, use_container_width=True)
+        nominal_nt = np.array(test_data['Nominal nT'], dtype=float)
+        measured = np.array(test_data['Measured (mR)'], dtype=float)
+        
+        # Calculate beam width
+        beam_width = measured / cal_dp_l if cal_dp_l > 0 else np.zeros_like(measured)
+        
+        # Calculate error
+        error = beam_width - nominal_nt
+        criteria = np.maximum(nominal_nt * 0.3, 3.0)  # Max of 30% nominal and 3mm
+        pass_mask = np.abs(error) <= criteria
+        
+        results_df = pd.DataFrame({
+            'n': test_data['n'],
+            'T (mm)': test_data['T'],
+            'nT Nominal (mm)': test_data['Nominal nT'],
+            'Measured (mR)': test_data['Measured (mR)'],
+            'Beam Width (mm)': beam_width,
+            'Error (mm)': error,
+            'Criteria (mm)': criteria,
+            'Result': np.where(pass_mask, '🟢 Pass', '🔴 Fail')
+        })
+        st.table(results_df.style.format({'Beam Width (mm)': '{:.2f}',
+                                          'Error (mm)': '{:.2f}',
+                                          'Criteria (mm)': '≤{:.1f}'}))
         
         # Overall assessment
-        all_pass = all('Pass' in result['Result'] for result in results)
+        all_pass = bool(pass_mask.all())
         overall_status = "🟢 Pass" if all_pass else "🔴 Fail"
         
-        st.markdown(f'<div class="{"pass-result" if all_pass else "fail-result"}">'
-                   f'<strong>Overall Beam Collimation:</strong> {overall_status}</div>', 
+        st.markdown(_RESULT_HTML.substitute(result_class="pass-result" if all_pass else "fail-result",
+                                            title="Overall Beam Collimation", body=overall_status),
                    unsafe_allow_html=True)
 
 def ct_number_accuracy_section():
     st.markdown('<div class="section-header">🎯 CT Number Accuracy</div>', unsafe_allow_html=True)
     
-    st.info("""
-    **Instructions:** 
-    - Use ACR CT Phantom Module 1
-    - Scan with clinical protocols 
-    - Measure CT numbers for Air, Acrylic, Water, and Bone inserts
-    - Use ROI size approximately 100 mm²
-    """)
-    
-    # Material reference values
-    materials_ref = {
-        'Air': {'expected': -1000, 'tolerance': 100},
-        'Acrylic': {'expected': 120, 'tolerance': 40},
-        'Water': {'expected': 0, 'tolerance': 7},
-        'Bone': {'expected': 850, 'tolerance': 100}
-    }
+    st.info(_CT_NUMBER_INSTRUCTIONS)
     
     st.subheader("📊 CT Number Measurements")
     
@@ -522,56 +639,44 @@ def ct_number_accuracy_section():
     # Measurements input
     col1, col2 = st.columns(2)
     
-    measurements = {}
-    with col1:
-        st.write("**ROI Measurements (HU):**")
-        measurements['Air'] = st.number_input("Air", value=-1000.0, step=1.0)
-        measurements['Acrylic'] = st.number_input("Acrylic", value=120.0, step=1.0)
-        
-    with col2:
-        st.write("**ROI Measurements (HU):**")
-        measurements['Water'] = st.number_input("Water", value=0.0, step=1.0)
-        measurements['Bone'] = st.number_input("Bone", value=850.0, step=1.0)
+    for col, materials in zip((col1, col2), (_MATERIAL_DEFAULTS[:2], _MATERIAL_DEFAULTS[2:])):
+        with col:
+            st.write("**ROI Measurements (HU):**")
+            for name, default in materials:
+                st.number_input(name, key=f"ctn_{name}", value=default, step=1.0)
+    
+    measurements = {name: st.session_state[f"ctn_{name}"] for name, _ in _MATERIAL_DEFAULTS}
     
     if st.button("🧮 Evaluate CT Numbers", type="primary"):
         st.subheader("📋 CT Number Results")
         
-        results = []
-        all_pass = True
-        
-        for material, measured_value in measurements.items():
-            expected = materials_ref[material]['expected']
-            tolerance = materials_ref[material]['tolerance']
-            difference = measured_value - expected
-            
-            # Special handling for water (stricter tolerance)
-            if material == 'Water':
-                pass_criteria = abs(difference) <= 7
-            else:
-                pass_criteria = abs(difference) <= tolerance
-            
-            if not pass_criteria:
-                all_pass = False
-            
-            status = "🟢 Pass" if pass_criteria else "🔴 Fail"
-            
-            results.append({
-                'Material': material,
-                'Measured (HU)': f"{measured_value:.1f}",
-                'Expected (HU)': f"{expected}",
-                'Difference (HU)': f"{difference:+.1f}",
-                'Tolerance (HU)': f"±{tolerance}",
-                'Result': status
-            })
-        
-        results_df = pd.DataFrame(results)
-        st.dataframe(results_df, use_container_width=True)
+        materials = list(measurements)
+        measured = np.array(list(measurements.values()), dtype=float)
+        expected = np.array([_MATERIALS_REF[m]['expected'] for m in materials])
+        tolerance = np.array([_MATERIALS_REF[m]['tolerance'] for m in materials])
+        
+        # Water carries the strict ±7 HU tolerance from the reference table
+        passed = _eval_materials(measured, expected, tolerance)
+        all_pass = bool(passed.all())
+        
+        results_df = pd.DataFrame({
+            'Material': materials,
+            'Measured (HU)': measured,
+            'Expected (HU)': expected,
+            'Difference (HU)': measured - expected,
+            'Tolerance (HU)': tolerance,
+            'Result': np.where(passed, '🟢 Pass', '🔴 Fail')
+        })
+        st.table(results_df.style.format({'Measured (HU)': '{:.1f}',
+                                          'Difference (HU)': '{:+.1f}',
+                                          'Tolerance (HU)': '±{}'}))
         
         # Overall result
         overall_status = "🟢 Pass" if all_pass else "🔴 Fail"
         result_class = "pass-result" if all_pass else "fail-result"
         
-        st.markdown(f'<div class="{result_class}"><strong>Overall CT Number Accuracy:</strong> {overall_status}</div>', 
+        st.markdown(_RESULT_HTML.substitute(result_class=result_class, title="Overall CT Number Accuracy",
+                                            body=overall_status),
                    unsafe_allow_html=True)
         
         # Save results
@@ -580,7 +685,7 @@ def ct_number_accuracy_section():
         
         st.session_state.qc_data['ct_number_results'][protocol] = {
             'measurements': measurements,
-            'results': results,
+            'results': results_df.to_dict('records'),
             'overall_pass': all_pass,
             'date': datetime.now().isoformat()
         }
@@ -588,13 +693,7 @@ def ct_number_accuracy_section():
 def low_contrast_resolution_section():
     st.markdown('<div class="section-header">🔍 Low Contrast Resolution</div>', unsafe_allow_html=True)
     
-    st.info("""
-    **Instructions:**
-    - Use ACR CT Phantom Module 2
-    - Window Width: 100, Window Level: 100
-    - ROI size: 100 mm²
-    - Identify smallest visible contrast objects
-    """)
+    st.info(_LOW_CONTRAST_INSTRUCTIONS)
     
     st.subheader("👁️ Object Visibility Assessment")
     
@@ -643,13 +742,11 @@ def low_contrast_resolution_section():
         noise_sd = st.number_input("Noise SD", value=6.0, step=0.1, format="%.1f")
     
     if st.button("🧮 Evaluate Low Contrast Resolution", type="primary"):
-        # Count visible objects
-        objects_6mm = sum([visibility['6mm_03'], visibility['6mm_05'], visibility['6mm_10']])
-        objects_4mm = sum([visibility['4mm_03'], visibility['4mm_05'], visibility['4mm_10']])
-        objects_3mm = sum([visibility['3mm_03'], visibility['3mm_05'], visibility['3mm_10']])
-        objects_2mm = sum([visibility['2mm_03'], visibility['2mm_05'], visibility['2mm_10']])
+        # Count visible objects (rows: 6/4/3/2 mm, columns: 0.3/0.5/1.0% contrast)
+        visible = np.fromiter(visibility.values(), dtype=bool, count=len(visibility)).reshape(4, 3)
+        objects_6mm, objects_4mm, objects_3mm, objects_2mm = visible.sum(axis=1).tolist()
         
-        total_visible = objects_6mm + objects_4mm + objects_3mm + objects_2mm
+        total_visible = int(visible.sum())
         
         # Check minimum requirement (6mm, 0.3% contrast)
         minimum_met = visibility['6mm_03']
@@ -658,14 +755,7 @@ def low_contrast_resolution_section():
         cnr = (signal - noise) / noise_sd if noise_sd > 0 else 0
         
         # Criteria based on protocol
-        cnr_criteria = {
-            "Adult Head": 1.0,
-            "Adult Abdomen": 1.0,
-            "Ped Head": 0.7,
-            "Ped Abd": 0.4
-        }
-        
-        cnr_required = cnr_criteria.get(protocol, 1.0)
+        cnr_required = _CNR_CRITERIA.get(protocol, 1.0)
         cnr_pass = cnr >= cnr_required
         
         st.subheader("📋 Low Contrast Resolution Results")
@@ -714,23 +804,18 @@ def low_contrast_resolution_section():
             'Status': overall_status
         })
         
-        results_df = pd.DataFrame(results)
-        st.dataframe(results_df, use_container_width=True)
+        results_df = pd.DataFrame.from_records(results, columns=['Test', 'Result', 'Criterion', 'Status'])
+        st.table(results_df)
         
         result_class = "pass-result" if overall_pass else "fail-result"
-        st.markdown(f'<div class="{result_class}"><strong>Low Contrast Resolution:</strong> {overall_status}</div>', 
+        st.markdown(_RESULT_HTML.substitute(result_class=result_class, title="Low Contrast Resolution",
+                                            body=overall_status),
                    unsafe_allow_html=True)
 
 def ct_uniformity_section():
     st.markdown('<div class="section-header">⚖️ CT Number Uniformity</div>', unsafe_allow_html=True)
     
-    st.info("""
-    **Instructions:**
-    - Use ACR CT Phantom Module 3
-    - Window Width: 100, Window Level: 0
-    - ROI size: 400 mm²
-    - Measure center and 4 peripheral ROIs
-    """)
+    st.info(_UNIFORMITY_INSTRUCTIONS)
     
     st.subheader("📊 Uniformity Measurements")
     
@@ -752,63 +837,58 @@ def ct_uniformity_section():
     with col3:
         right_roi = st.number_input("Right ROI (HU)", value=0.0, step=0.1, format="%.1f")
     
+    uniformity_key = (protocol, center_roi, top_roi, bottom_roi, left_roi, right_roi)
+    
     if st.button("🧮 Evaluate Uniformity", type="primary"):
         # Calculate uniformity
-        peripheral_rois = [top_roi, bottom_roi, left_roi, right_roi]
-        differences = [abs(roi - center_roi) for roi in peripheral_rois]
-        max_difference = max(differences)
+        rois = np.array([center_roi, top_roi, bottom_roi, left_roi, right_roi], dtype=np.float64)
+        peripheral_rois = rois[1:]
+        differences = np.abs(peripheral_rois - center_roi)
+        max_difference = differences.max()
         
         # Calculate non-uniformity percentage
-        roi_max = max([center_roi] + peripheral_rois)
-        roi_min = min([center_roi] + peripheral_rois)
+        roi_max = rois.max()
+        roi_min = rois.min()
         non_uniformity = ((roi_max - roi_min) / (roi_max + roi_min)) * 100 if (roi_max + roi_min) != 0 else 0
         
-        st.subheader("📋 Uniformity Results")
-        
-        # Display measurements
-        col4, col5, col6 = st.columns(3)
-        with col4:
-            st.metric("Center ROI", f"{center_roi:.1f} HU")
-            st.metric("Max Difference", f"{max_difference:.1f} HU")
-        with col5:
-            st.metric("ROI Range", f"{roi_min:.1f} to {roi_max:.1f} HU")
-            st.metric("Non-uniformity", f"{non_uniformity:.1f}%")
-        with col6:
-            uniformity_pass = max_difference <= 5.0
-            status = "🟢 Pass" if uniformity_pass else "🔴 Fail"
-            st.metric("Criterion", "≤ 5 HU")
-            st.metric("Result", status)
+        uniformity_pass = max_difference <= 5.0
+        status = "🟢 Pass" if uniformity_pass else "🔴 Fail"
         
         # Detailed results table
-        results = []
-        for i, (position, roi_value) in enumerate(zip(['Top', 'Bottom', 'Left', 'Right'], peripheral_rois)):
-            diff = abs(roi_value - center_roi)
-            results.append({
-                'Position': position,
-                'ROI Value (HU)': f"{roi_value:.1f}",
-                'Difference from Center (HU)': f"{diff:.1f}",
-                'Status': "🟢 Pass" if diff <= 5.0 else "🔴 Fail"
-            })
-        
-        results_df = pd.DataFrame(results)
-        st.dataframe(results_df, use_container_width=True)
+        results_df = pd.DataFrame({
+            'Position': ['Top', 'Bottom', 'Left', 'Right'],
+            'ROI Value (HU)': peripheral_rois,
+            'Difference from Center (HU)': differences,
+            'Status': np.where(differences <= 5.0, "🟢 Pass", "🔴 Fail")
+        })
         
         # Overall assessment
         result_class = "pass-result" if uniformity_pass else "fail-result"
-        st.markdown(f'<div class="{result_class}"><strong>CT Number Uniformity:</strong> {status}<br>'
-                   f'Maximum deviation: {max_difference:.1f} HU (Criterion: ≤ 5 HU)</div>', 
-                   unsafe_allow_html=True)
+        _store_results('uniformity', uniformity_key, {
+            'title': "📋 Uniformity Results",
+            'metrics': (
+                (("Center ROI", f"{center_roi:.1f} HU"),
+                 ("Max Difference", f"{max_difference:.1f} HU")),
+                (("ROI Range", f"{roi_min:.1f} to {roi_max:.1f} HU"),
+                 ("Non-uniformity", f"{non_uniformity:.1f}%")),
+                (("Criterion", "≤ 5 HU"),
+                 ("Result", status))
+            ),
+            'table': results_df.style.format({'ROI Value (HU)': '{:.1f}',
+                                              'Difference from Center (HU)': '{:.1f}'}),
+            'summary': _RESULT_HTML.substitute(
+                result_class=result_class, title="CT Number Uniformity",
+                body=f'{status}<br>Maximum deviation: {max_difference:.1f} HU (Criterion: ≤ 5 HU)')
+        })
+    
+    render = _stored_results('uniformity', uniformity_key)
+    if render is not None:
+        _show_results(render)
 
 def artifacts_section():
     st.markdown('<div class="section-header">🖼️ Artifacts Assessment</div>', unsafe_allow_html=True)
     
-    st.info("""
-    **Instructions:**
-    - Use ACR CT Phantom Module 3
-    - Window Width: 100, Window Level: 0
-    - Look for streaks, rings, cupping artifacts
-    - Use 32cm phantom to check for ring artifacts beyond 20cm diameter
-    """)
+    st.info(_ARTIFACTS_INSTRUCTIONS)
     
     st.subheader("👁️ Artifact Evaluation")
     
@@ -843,19 +923,14 @@ def artifacts_section():
         image_quality = st.selectbox("Overall Image Quality", ["Excellent", "Good", "Fair", "Poor"])
         clinical_impact = st.selectbox("Clinical Impact", ["None", "Minimal", "Moderate", "Significant"])
     
+    artifacts_key = (protocol, streaks, rings, cupping, motion, noise_variation, other_artifacts,
+                     phantom_32cm, beyond_20cm, image_quality, clinical_impact)
+    
     if st.button("🧮 Evaluate Artifacts", type="primary"):
-        st.subheader("📋 Artifacts Assessment Results")
-        
-        # Score artifacts
-        artifact_scores = {
-            "None": 0,
-            "Minor": 1,
-            "Major": 2
-        }
-        
-        total_score = (artifact_scores[streaks] + artifact_scores[rings] + 
-                      artifact_scores[cupping] + artifact_scores[motion] + 
-                      artifact_scores[noise_variation])
+        # Score artifacts: None = 0, Minor = 1, Major = 2
+        severities = np.array([streaks, rings, cupping, motion, noise_variation])
+        scores = (severities != "None").astype(np.int8) + (severities == "Major").astype(np.int8)
+        total_score = int(scores.sum())
         
         # Assessment based on total score
         if total_score == 0:
@@ -868,47 +943,34 @@ def artifacts_section():
             overall_status = "🔴 Major - Significant artifacts detected"
             result_class = "fail-result"
         
-        # Display results
-        results = []
-        artifacts_list = [
-            ('Streaks/Lines', streaks),
-            ('Ring Artifacts', rings),
-            ('Cupping', cupping),
-            ('Motion Artifacts', motion),
-            ('Noise Variation', noise_variation)
-        ]
-        
-        for artifact_type, severity in artifacts_list:
-            results.append({
-                'Artifact Type': artifact_type,
-                'Severity': severity,
-                'Score': artifact_scores[severity],
-                'Impact': "None" if severity == "None" else ("Low" if severity == "Minor" else "High")
-            })
-        
-        results_df = pd.DataFrame(results)
-        st.dataframe(results_df, use_container_width=True)
+        results_df = pd.DataFrame({
+            'Artifact Type': ['Streaks/Lines', 'Ring Artifacts', 'Cupping', 'Motion Artifacts', 'Noise Variation'],
+            'Severity': severities,
+            'Score': scores,
+            'Impact': _ARTIFACT_IMPACT[scores]
+        })
         
         # Overall assessment
-        st.markdown(f'<div class="{result_class}"><strong>Artifacts Assessment:</strong> {overall_status}<br>'
-                   f'Total Score: {total_score}/10<br>'
-                   f'Image Quality: {image_quality}<br>'
-                   f'Clinical Impact: {clinical_impact}</div>', 
-                   unsafe_allow_html=True)
-        
-        if other_artifacts:
-            st.write(f"**Additional Notes:** {other_artifacts}")
+        _store_results('artifacts', artifacts_key, {
+            'title': "📋 Artifacts Assessment Results",
+            'table': results_df,
+            'summary': _RESULT_HTML.substitute(
+                result_class=result_class, title="Artifacts Assessment",
+                body=f'{overall_status}<br>'
+                     f'Total Score: {total_score}/10<br>'
+                     f'Image Quality: {image_quality}<br>'
+                     f'Clinical Impact: {clinical_impact}'),
+            'notes': f"**Additional Notes:** {other_artifacts}" if other_artifacts else None
+        })
+    
+    render = _stored_results('artifacts', artifacts_key)
+    if render is not None:
+        _show_results(render)
 
 def spatial_resolution_section():
     st.markdown('<div class="section-header">📐 Spatial Resolution</div>', unsafe_allow_html=True)
     
-    st.info("""
-    **Instructions:**
-    - Use ACR CT Phantom Module 4
-    - Window Width: 100, Window Level: 1100
-    - Determine highest resolvable line pairs per cm
-    - Adult Abdomen: ≥ 6 lp/cm, High Resolution Chest: ≥ 8 lp/cm
-    """)
+    st.info(_RESOLUTION_INSTRUCTIONS)
     
     st.subheader("🔍 Resolution Measurements")
     
@@ -934,36 +996,17 @@ def spatial_resolution_section():
                                     ["Excellent", "Good", "Fair", "Poor"])
     
     # Criteria based on protocol
-    criteria_map = {
-        "Adult Abdomen": 6.0,
-        "Adult Head": 6.0, 
-        "Ped Abd": 6.0,
-        "Ped Head": 6.0,
-        "High Resolution Chest": 8.0
-    }
+    required_resolution = _CRITERIA_MAP.get(protocol, 6.0)
     
-    required_resolution = criteria_map.get(protocol, 6.0)
+    resolution_key = (protocol, measured_resolution, baseline_resolution, visual_quality)
     
     if st.button("🧮 Evaluate Spatial Resolution", type="primary"):
-        st.subheader("📋 Spatial Resolution Results")
-        
         # Evaluate against criteria
+        deviation = abs(measured_resolution - baseline_resolution)
         meets_minimum = measured_resolution >= required_resolution
-        baseline_comparison = abs(measured_resolution - baseline_resolution) <= 1.0
-        
-        # Display metrics
-        col4, col5, col6 = st.columns(3)
-        with col4:
-            st.metric("Measured Resolution", f"{measured_resolution:.1f} lp/cm")
-            st.metric("Required Minimum", f"{required_resolution:.1f} lp/cm")
-        with col5:
-            st.metric("Baseline Resolution", f"{baseline_resolution:.1f} lp/cm")
-            st.metric("Deviation from Baseline", f"{abs(measured_resolution - baseline_resolution):.1f} lp/cm")
-        with col6:
-            st.metric("Visual Quality", visual_quality)
-            overall_pass = meets_minimum and baseline_comparison
-            status = "🟢 Pass" if overall_pass else "🔴 Fail"
-            st.metric("Overall Result", status)
+        baseline_comparison = deviation <= 1.0
+        overall_pass = meets_minimum and baseline_comparison
+        status = "🟢 Pass" if overall_pass else "🔴 Fail"
         
         # Detailed results
         results = []
@@ -979,7 +1022,7 @@ def spatial_resolution_section():
         baseline_status = "🟢 Pass" if baseline_comparison else "🟡 Monitor"
         results.append({
             'Test': 'Baseline Comparison',
-            'Result': f"{abs(measured_resolution - baseline_resolution):.1f} lp/cm deviation",
+            'Result': f"{deviation:.1f} lp/cm deviation",
             'Criterion': "≤ 1.0 lp/cm from baseline",
             'Status': baseline_status
         })
@@ -991,14 +1034,72 @@ def spatial_resolution_section():
             'Status': "🟢 Pass" if visual_quality in ["Excellent", "Good"] else "🟡 Monitor"
         })
         
-        results_df = pd.DataFrame(results)
-        st.dataframe(results_df, use_container_width=True)
-        
         # Overall assessment
         result_class = "pass-result" if overall_pass else "fail-result"
-        st.markdown(f'<div class="{result_class}"><strong>Spatial Resolution:</strong> {status}<br>'
-                   f'Measured: {measured_resolution:.1f} lp/cm (Required: ≥{required_resolution:.1f} lp/cm)</div>', 
-                   unsafe_allow_html=True)
+        _store_results('resolution', resolution_key, {
+            'title': "📋 Spatial Resolution Results",
+            'metrics': (
+                (("Measured Resolution", f"{measured_resolution:.1f} lp/cm"),
+                 ("Required Minimum", f"{required_resolution:.1f} lp/cm")),
+                (("Baseline Resolution", f"{baseline_resolution:.1f} lp/cm"),
+                 ("Deviation from Baseline", f"{deviation:.1f} lp/cm")),
+                (("Visual Quality", visual_quality),
+                 ("Overall Result", status))
+            ),
+            'table': pd.DataFrame(results),
+            'summary': _RESULT_HTML.substitute(
+                result_class=result_class, title="Spatial Resolution",
+                body=f'{status}<br>Measured: {measured_resolution:.1f} lp/cm '
+                     f'(Required: ≥{required_resolution:.1f} lp/cm)')
+        })
+    
+    render = _stored_results('resolution', resolution_key)
+    if render is not None:
+        _show_results(render)
+
+@st.cache_resource(show_spinner=False)
+def _build_trend_figure(parameter, x_bytes, y_bytes):
+    """Build the trending chart; dates and values arrive as raw array bytes"""
+    import plotly.graph_objects as go
+    
+    x_values = np.frombuffer(x_bytes, dtype='datetime64[ns]')
+    y_values = np.frombuffer(y_bytes, dtype=np.float64)
+    
+    fig = go.Figure()
+    
+    # Add data trace; long histories switch to WebGL to stay responsive
+    scatter = go.Scattergl if len(y_values) > _WEBGL_POINT_THRESHOLD else go.Scatter
+    fig.add_trace(scatter(
+        x=x_values,
+        y=y_values,
+        mode='lines+markers',
+        name=parameter,
+        line=dict(color='#1f77b4', width=2),
+        marker=dict(size=4)
+    ))
+    
+    # Add control limits based on parameter
+    if parameter == "Water CT Number":
+        fig.add_hline(y=7, line_dash="dash", line_color="red", annotation_text="Upper Action Level (+7 HU)")
+        fig.add_hline(y=-7, line_dash="dash", line_color="red", annotation_text="Lower Action Level (-7 HU)")
+        fig.add_hline(y=0, line_dash="dot", line_color="green", annotation_text="Target (0 HU)")
+    elif parameter == "Image Noise":
+        fig.add_hline(y=16, line_dash="dash", line_color="red", annotation_text="Action Level (16 HU)")
+    elif parameter == "Head CTDI":
+        fig.add_hline(y=75, line_dash="dash", line_color="red", annotation_text="ACR Reference (75 mGy)")
+    elif parameter == "Body CTDI":
+        fig.add_hline(y=25, line_dash="dash", line_color="red", annotation_text="ACR Reference (25 mGy)")
+    elif parameter == "Uniformity":
+        fig.add_hline(y=5, line_dash="dash", line_color="red", annotation_text="Action Level (5 HU)")
+    
+    fig.update_layout(
+        title=f"{parameter} Trending Analysis",
+        xaxis_title="Date",
+        yaxis_title=parameter,
+        hovermode='x unified'
+    )
+    
+    return fig
 
 def data_analysis_section():
     st.markdown('<div class="section-header">📈 Data Analysis & Trending</div>', unsafe_allow_html=True)
@@ -1014,124 +1115,98 @@ def data_analysis_section():
         st.subheader("📊 QC Parameter Trending")
         
         # Parameter selection
-        parameter = st.selectbox("Select Parameter to Display:", 
-                               ["Water CT Number", "Image Noise", "Head CTDI", "Body CTDI", "Uniformity"])
+        parameter = st.selectbox("Select Parameter to Display:", list(_PARAM_MAP))
         
         # Create trending chart
-        fig = go.Figure()
-        
-        param_map = {
-            "Water CT Number": "water_ct",
-            "Image Noise": "noise", 
-            "Head CTDI": "ctdi_head",
-            "Body CTDI": "ctdi_body",
-            "Uniformity": "uniformity"
-        }
-        
-        y_col = param_map[parameter]
-        
-        # Add data trace
-        fig.add_trace(go.Scatter(
-            x=df['date'],
-            y=df[y_col],
-            mode='lines+markers',
-            name=parameter,
-            line=dict(color='#1f77b4', width=2),
-            marker=dict(size=4)
-        ))
-        
-        # Add control limits based on parameter
-        if parameter == "Water CT Number":
-            fig.add_hline(y=7, line_dash="dash", line_color="red", annotation_text="Upper Action Level (+7 HU)")
-            fig.add_hline(y=-7, line_dash="dash", line_color="red", annotation_text="Lower Action Level (-7 HU)")
-            fig.add_hline(y=0, line_dash="dot", line_color="green", annotation_text="Target (0 HU)")
-        elif parameter == "Image Noise":
-            fig.add_hline(y=16, line_dash="dash", line_color="red", annotation_text="Action Level (16 HU)")
-        elif parameter == "Head CTDI":
-            fig.add_hline(y=75, line_dash="dash", line_color="red", annotation_text="ACR Reference (75 mGy)")
-        elif parameter == "Body CTDI":
-            fig.add_hline(y=25, line_dash="dash", line_color="red", annotation_text="ACR Reference (25 mGy)")
-        elif parameter == "Uniformity":
-            fig.add_hline(y=5, line_dash="dash", line_color="red", annotation_text="Action Level (5 HU)")
-        
-        fig.update_layout(
-            title=f"{parameter} Trending Analysis",
-            xaxis_title="Date",
-            yaxis_title=parameter,
-            hovermode='x unified'
-        )
+        y_col = _PARAM_MAP[parameter]
+        x_values = df['date'].to_numpy(dtype='datetime64[ns]')
+        y_values = df[y_col].to_numpy(dtype=np.float64)
         
+        fig = _build_trend_figure(parameter, x_values.tobytes(), y_values.tobytes())
         st.plotly_chart(fig, use_container_width=True)
         
         # Statistical summary
         st.subheader("📊 Statistical Summary")
         
+        stats = df[y_col].agg(['mean', 'std', 'min', 'max'])
+        
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Mean", f"{df[y_col].mean():.2f}")
+            st.metric("Mean", f"{stats['mean']:.2f}")
         with col2:
-            st.metric("Std Dev", f"{df[y_col].std():.2f}")
+            st.metric("Std Dev", f"{stats['std']:.2f}")
         with col3:
-            st.metric("Min", f"{df[y_col].min():.2f}")
+            st.metric("Min", f"{stats['min']:.2f}")
         with col4:
-            st.metric("Max", f"{df[y_col].max():.2f}")
+            st.metric("Max", f"{stats['max']:.2f}")
         
         # Control chart analysis
         st.subheader("🎛️ Control Chart Analysis")
         
-        mean_val = df[y_col].mean()
-        std_val = df[y_col].std()
+        mean_val = stats['mean']
+        std_val = stats['std']
         
         # Check for out-of-control points
-        ucl_3sigma = mean_val + 3 * std_val
-        lcl_3sigma = mean_val - 3 * std_val
-        ucl_2sigma = mean_val + 2 * std_val
-        lcl_2sigma = mean_val - 2 * std_val
+        lcl_3sigma, lcl_2sigma, ucl_2sigma, ucl_3sigma = mean_val + _SIGMA_MULTIPLES * std_val
         
-        out_of_control = df[(df[y_col] > ucl_3sigma) | (df[y_col] < lcl_3sigma)]
-        warning_points = df[((df[y_col] > ucl_2sigma) & (df[y_col] <= ucl_3sigma)) | 
-                          ((df[y_col] < lcl_2sigma) & (df[y_col] >= lcl_3sigma))]
+        out_of_control = (y_values > ucl_3sigma) | (y_values < lcl_3sigma)
+        warning = ((y_values > ucl_2sigma) | (y_values < lcl_2sigma)) & ~out_of_control
+        n_out_of_control = int(out_of_control.sum())
+        n_warning = int(warning.sum())
         
         col5, col6, col7 = st.columns(3)
         with col5:
-            st.metric("Out of Control Points", len(out_of_control))
+            st.metric("Out of Control Points", n_out_of_control)
         with col6:
-            st.metric("Warning Points", len(warning_points))
+            st.metric("Warning Points", n_warning)
         with col7:
-            trend_status = "🟢 Stable" if len(out_of_control) == 0 else "🔴 Investigate"
+            trend_status = "🟢 Stable" if n_out_of_control == 0 else "🔴 Investigate"
             st.metric("Trend Status", trend_status)
         
         # Export data option
         if st.button("💾 Export Trending Data"):
-            csv = df.to_csv(index=False)
+            csv = _csv_bytes(df)
             st.download_button(
                 label="📁 Download CSV",
                 data=csv,
-                file_name=f"CT_QC_Trending_{datetime.now().strftime('%Y%m%d')}.csv",
+                file_name=f"CT_QC_Trending_{st.session_state._today_str}.csv",
                 mime='text/csv'
             )
 
+@st.cache_data(ttl=3600)
+def _build_trending_df(end_date, n_weeks):
+    """Build weekly sample trending data ending at end_date, seeded by that date"""
+    dates = pd.date_range(end=end_date, periods=n_weeks, freq='W')
+    n = len(dates)
+    rng = np.random.default_rng(end_date.toordinal())
+    
+    # Add realistic variation around actual facility values
+    return pd.DataFrame({
+        'date': dates,
+        'water_ct': rng.normal(0, 2.5, n),  # ±7 HU tolerance
+        'noise': rng.normal(3.5, 0.8, n),   # Around 3.5 HU baseline
+        'ctdi_head': rng.normal(62, 3, n),   # Around 62 mGy from your data
+        'ctdi_body': rng.normal(19, 2, n),   # Around 19 mGy from your data
+        'uniformity': rng.uniform(1, 4, n)   # 1-4 HU range
+    })
+
+@st.cache_data
+def _csv_bytes(df):
+    """Encode a DataFrame as CSV bytes for download"""
+    return df.to_csv(index=False).encode('utf-8')
+
 def generate_sample_trending_data():
     """Generate realistic sample data based on actual facility values"""
-    dates = pd.date_range(start=datetime.now() - timedelta(days=365), end=datetime.now(), freq='W')
-    
-    data = []
-    for date in dates:
-        # Add realistic variation around actual facility values
-        data.append({
-            'date': date,
-            'water_ct': np.random.normal(0, 2.5),  # ±7 HU tolerance
-            'noise': np.random.normal(3.5, 0.8),   # Around 3.5 HU baseline
-            'ctdi_head': np.random.normal(62, 3),   # Around 62 mGy from your data
-            'ctdi_body': np.random.normal(19, 2),   # Around 19 mGy from your data
-            'uniformity': np.random.uniform(1, 4)   # 1-4 HU range
-        })
-    
-    st.session_state.trending_data = pd.DataFrame(data)
+    st.session_state.trending_data = _build_trending_df(date.today(), 52)
 
 def report_generation_section():
     st.markdown('<div class="section-header">📑 Report Generation</div>', unsafe_allow_html=True)
     
+    # Seed the keyed inputs from the saved facility information
+    scanner_info = st.session_state.scanner_info
+    st.session_state.setdefault("report_physicist", scanner_info['physicist1'])
+    st.session_state.setdefault("report_facility", scanner_info['facility'])
+    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -1139,13 +1214,11 @@ def report_generation_section():
         report_date = st.date_input("Report Date", value=date.today())
         report_type = st.selectbox("Report Type", 
                                  ["Annual QC Summary", "Monthly Trending", "Incident Report"])
-        physicist_name = st.text_input("Medical Physicist", 
-                                     value=st.session_state.scanner_info['physicist1'])
+        physicist_name = st.text_input("Medical Physicist", key="report_physicist")
         
     with col2:
         st.subheader("🏥 Facility Information") 
-        facility_name = st.text_input("Facility Name", 
-                                    value=st.session_state.scanner_info['facility'])
+        facility_name = st.text_input("Facility Name", key="report_facility")
         report_period = st.text_input("Report Period", 
                                     value="January 2025 - December 2025")
         
@@ -1174,40 +1247,16 @@ def report_generation_section():
         else:
             st.error("⚠️ Please fill in all required fields")
 
-def generate_comprehensive_report(report_type, report_date, physicist, facility, period):
-    """Generate comprehensive QC report based on facility template"""
-    
-    scanner_info = st.session_state.scanner_info
-    today = datetime.now().strftime("%B %d, %Y")
-    
-    # Get QC results if available
-    dosimetry_results = st.session_state.qc_data.get('dosimetry_results', {})
-    ct_number_results = st.session_state.qc_data.get('ct_number_results', {})
-    
-    report = f"""
+# Static sections of the comprehensive QC report; only the facility details,
+# certification lines and contact line are filled in per report
+_REPORT_HEADER = """
 COMPUTERIZED TOMOGRAPHY QUALITY CONTROL REPORT
 
 ═══════════════════════════════════════════════════════════════
 
-FACILITY INFORMATION:
-Facility Name: {facility}
-Address: {scanner_info['address']}
-Location: {scanner_info['location']}
-X-ray License: {scanner_info['xray_license']}
-
-EQUIPMENT INFORMATION:
-Manufacturer: {scanner_info['manufacturer']}
-Model: {scanner_info['model']}
-Serial Number: {scanner_info['serial']}
-
-SURVEY INFORMATION:
-Report Type: {report_type}
-Report Date: {report_date}
-Report Period: {period}
-Primary Medical Physicist: {physicist}
-Secondary Medical Physicist: {scanner_info['physicist2'] or 'N/A'}
+"""
 
-═══════════════════════════════════════════════════════════════
+_REPORT_BODY = """═══════════════════════════════════════════════════════════════
 
 EXECUTIVE SUMMARY
 
@@ -1388,11 +1437,9 @@ This report addresses requirements for:
 
 REPORT CERTIFICATION
 
-Report Prepared By: {physicist}, Medical Physicist
-Date of Report: {today}
-Facility: {facility}
+"""
 
-I certify that the information contained in this report accurately reflects 
+_REPORT_CERTIFICATION = """I certify that the information contained in this report accurately reflects 
 the testing performed and results obtained during the quality control 
 evaluation of the computed tomography equipment identified above.
 
@@ -1419,8 +1466,9 @@ Appendix E: Manufacturer Specifications
 ═══════════════════════════════════════════════════════════════
 
 For questions regarding this report or the quality control program, 
-contact the Medical Physics Department at {facility}.
+"""
 
+_REPORT_DISTRIBUTION = """
 Report Distribution:
 - Medical Physics Department (Original)
 - Radiology Department Administration
@@ -1431,27 +1479,95 @@ Report Distribution:
 ═══════════════════════════════════════════════════════════════
 End of Report
 """
+
+def generate_comprehensive_report(report_type, report_date, physicist, facility, period):
+    """Generate comprehensive QC report based on facility template"""
+    scanner_info_tuple = tuple(sorted(st.session_state.scanner_info.items()))
+    today = datetime.now().strftime("%B %d, %Y")
     
-    return report
+    return _render_report(report_type, report_date, physicist, facility, period,
+                          scanner_info_tuple, today)
+
+@st.cache_data(max_entries=32)
+def _render_report(report_type, report_date, physicist, facility, period, scanner_info_tuple, today):
+    """Render the report text; cached on its scalar inputs"""
+    si = dict(scanner_info_tuple)
+    
+    return "".join([
+        _REPORT_HEADER,
+        f"""FACILITY INFORMATION:
+Facility Name: {facility}
+Address: {si['address']}
+Location: {si['location']}
+X-ray License: {si['xray_license']}
+
+EQUIPMENT INFORMATION:
+Manufacturer: {si['manufacturer']}
+Model: {si['model']}
+Serial Number: {si['serial']}
+
+SURVEY INFORMATION:
+Report Type: {report_type}
+Report Date: {report_date}
+Report Period: {period}
+Primary Medical Physicist: {physicist}
+Secondary Medical Physicist: {si['physicist2'] or 'N/A'}
+
+""",
+        _REPORT_BODY,
+        f"""Report Prepared By: {physicist}, Medical Physicist
+Date of Report: {today}
+Facility: {facility}
+
+""",
+        _REPORT_CERTIFICATION,
+        f"contact the Medical Physics Department at {facility}.\n",
+        _REPORT_DISTRIBUTION
+    ])
+
+# Sidebar navigation entries and their section renderers
+_SECTIONS = (
+    ("🏥 Facility Information", facility_info_section),
+    ("📊 Protocol Review", protocol_review_section),
+    ("☢️ Dosimetry Assessment", dosimetry_section),
+    ("📏 Beam Collimation", beam_collimation_section),
+    ("🎯 CT Number Accuracy", ct_number_accuracy_section),
+    ("🔍 Low Contrast Resolution", low_contrast_resolution_section),
+    ("⚖️ CT Number Uniformity", ct_uniformity_section),
+    ("🖼️ Artifacts Assessment", artifacts_section),
+    ("📐 Spatial Resolution", spatial_resolution_section),
+    ("📈 Data Analysis & Trending", data_analysis_section),
+    ("📑 Report Generation", report_generation_section)
+)
+_SECTION_MAP = dict(_SECTIONS)
 
 # Add some utility functions for enhanced functionality
 def export_qc_data():
     """Export all QC data to JSON format"""
     if st.session_state.qc_data:
-        qc_json = json.dumps(st.session_state.qc_data, indent=2, default=str)
+        qc_json = orjson.dumps(
+            st.session_state.qc_data,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
         st.download_button(
             label="📁 Download QC Data (JSON)",
             data=qc_json,
-            file_name=f"CT_QC_Data_{datetime.now().strftime('%Y%m%d')}.json",
+            file_name=f"CT_QC_Data_{st.session_state._today_str}.json",
             mime='application/json'
         )
 
+@st.cache_data
+def _parse_qc(raw):
+    """Parse uploaded QC data JSON bytes"""
+    return orjson.loads(raw)
+
 def import_qc_data():
     """Import QC data from JSON file"""
     uploaded_file = st.file_uploader("Choose QC data file", type="json")
     if uploaded_file is not None:
         try:
-            qc_data = json.loads(uploaded_file.read())
+            qc_data = _parse_qc(uploaded_file.getvalue())
             st.session_state.qc_data = qc_data
             st.success("✅ QC data imported successfully!")
         except Exception as e: